@@ -1,24 +1,285 @@
-from flask import Flask, request, jsonify
+from flask import (
+    Blueprint, Flask, Response, current_app, g, has_request_context, request, jsonify,
+    stream_with_context,
+)
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-import os, json, re
+import click
+from sqlalchemy import or_, case, event, func, literal_column, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import JSONB
+import os, json, re, atexit, html, base64, hashlib, logging, math, queue, random, sys, threading, time
+from logging.handlers import QueueHandler, QueueListener
+from functools import wraps
+from urllib.parse import urlencode, urlsplit
+from collections import Counter, defaultdict, namedtuple
 from collections import OrderedDict
+from datetime import datetime, timezone
 
-app = Flask(__name__)
+try:
+    import redis
+except ImportError:  # optional, only needed for CACHE_BACKEND=redis
+    redis = None
+
+# Routes and CLI commands live on this blueprint; create_app() (at the
+# bottom) builds the Flask app. Importing this module does not touch the
+# database: engines connect on first use and tables are created by
+# `flask --app app init-db`, not at import.
+api = Blueprint("api", __name__, cli_group=None)
 
 # ----------------------------
 # DATABASE (RENDER POSTGRES)
 # ----------------------------
-db_url = os.getenv("DATABASE_URL")
+def database_url():
+    db_url = os.getenv("DATABASE_URL")
+
+    # Render gives postgres:// but SQLAlchemy needs postgresql://
+    if db_url and db_url.startswith("postgres://"):
+        db_url = db_url.replace("postgres://", "postgresql://", 1)
+    return db_url
+
+
+def engine_options(url):
+    """Connection pool settings, overridable per deploy via DB_* env vars.
+
+    DB_POOL_SIZE should cover the threads/greenlets of one worker (see
+    gunicorn.conf.py, which defaults it to the thread count). Each worker
+    holds at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections, so keep
+    workers * that below the Postgres connection limit.
+    """
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+    if not url or url.startswith("sqlite"):
+        return options  # SQLite uses its own single-file / in-memory pools
+
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Render / cloud load balancers drop idle connections
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+    if url.startswith("postgresql"):
+        statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+        options["connect_args"] = {
+            "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            "options": "-c statement_timeout=%d" % statement_timeout,
+        }
+    return options
+
+
+db = SQLAlchemy()
+
+# ----------------------------
+# INSTRUMENTATION
+# ----------------------------
+# Structured JSON logs go through a queue so request threads never block
+# on stdout. Per request we track DB time, query count and JSON
+# serialization time (Server-Timing header), flag slow queries and
+# repeated statements (likely N+1), and keep per-route Prometheus metrics
+# served from /metrics. Metrics are per worker process.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+logger = logging.getLogger("properties")
+logger.setLevel(LOG_LEVEL)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = None
+
+
+def _start_log_listener():
+    # Also runs in each forked gunicorn worker: threads do not survive fork
+    global _log_listener
+    _log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+    _log_listener.start()
+
+
+_start_log_listener()
+os.register_at_fork(after_in_child=_start_log_listener)
+atexit.register(lambda: _log_listener.stop())
+
+
+def log_event(level, event, **fields):
+    if logger.isEnabledFor(level):
+        fields = dict(event=event, ts=round(time.time(), 3), **fields)
+        logger.log(level, json.dumps(fields, default=str))
+
+
+class RequestStats:
+    __slots__ = ("started", "db_time", "queries", "statements", "serialize_time")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.statements = Counter()
+        self.serialize_time = 0.0
+
+
+def current_stats():
+    if has_request_context():
+        return g.get("request_stats")
+    return None
+
+
+class Metrics:
+    """Minimal Prometheus registry: request histogram + counters per route."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.histograms = defaultdict(lambda: [[0] * len(self.buckets), 0, 0.0])
+        self.requests = Counter()
+        self.db_queries = Counter()
+        self.db_seconds = Counter()
+        self.slow_queries = 0
+
+    def observe(self, route, method, status, seconds, stats):
+        with self._lock:
+            counts, _, _ = hist = self.histograms[(route, method)]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            hist[1] += 1
+            hist[2] += seconds
+            self.requests[(route, method, status)] += 1
+            self.db_queries[route] += stats.queries
+            self.db_seconds[route] += stats.db_time
+
+    def slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self):
+        def labels(**kw):
+            return "{%s}" % ",".join('%s="%s"' % (k, str(v).replace('"', '\\"')) for k, v in kw.items())
+
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (route, method), (counts, count, total) in sorted(self.histograms.items()):
+                for bound, n in zip(self.buckets, counts):
+                    lines.append("http_request_duration_seconds_bucket%s %d" % (
+                        labels(route=route, method=method, le=bound), n))
+                lines.append("http_request_duration_seconds_bucket%s %d" % (
+                    labels(route=route, method=method, le="+Inf"), count))
+                lines.append("http_request_duration_seconds_count%s %d" % (labels(route=route, method=method), count))
+                lines.append("http_request_duration_seconds_sum%s %.6f" % (labels(route=route, method=method), total))
+
+            lines += ["# HELP http_requests_total Requests by route and status.",
+                      "# TYPE http_requests_total counter"]
+            for (route, method, status), n in sorted(self.requests.items()):
+                lines.append("http_requests_total%s %d" % (labels(route=route, method=method, status=status), n))
+
+            lines += ["# HELP db_queries_total SQL statements executed while serving a route.",
+                      "# TYPE db_queries_total counter"]
+            for route, n in sorted(self.db_queries.items()):
+                lines.append("db_queries_total%s %d" % (labels(route=route), n))
+
+            lines += ["# HELP db_query_seconds_total Time spent in SQL while serving a route.",
+                      "# TYPE db_query_seconds_total counter"]
+            for route, n in sorted(self.db_seconds.items()):
+                lines.append("db_query_seconds_total%s %.6f" % (labels(route=route), n))
+
+            lines += ["# HELP db_slow_queries_total Statements slower than SLOW_QUERY_MS.",
+                      "# TYPE db_slow_queries_total counter",
+                      "db_slow_queries_total %d" % self.slow_queries]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
 
-# Render gives postgres:// but SQLAlchemy needs postgresql://
-if db_url and db_url.startswith("postgres://"):
-    db_url = db_url.replace("postgres://", "postgresql://", 1)
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that books dumps() time on the request."""
 
-app.config['JSON_SORT_KEYS'] = False
-app.config["SQLALCHEMY_DATABASE_URI"] = db_url
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            stats = current_stats()
+            if stats is not None:
+                stats.serialize_time += time.perf_counter() - started
 
-db = SQLAlchemy(app)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.db_time += elapsed
+        stats.queries += 1
+        stats.statements[statement] += 1
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        metrics.slow_query()
+        log_event(logging.WARNING, "db.slow_query",
+                  duration_ms=round(elapsed * 1000, 2), statement=statement[:1000],
+                  path=request.path if has_request_context() else None)
+
+
+@api.before_app_request
+def _start_request_stats():
+    g.request_stats = RequestStats()
+
+
+def _record_request(stats, route, method, status):
+    elapsed = time.perf_counter() - stats.started
+    metrics.observe(route, method, status, elapsed, stats)
+
+    if stats.statements:
+        statement, repeats = stats.statements.most_common(1)[0]
+        if repeats >= N_PLUS_ONE_THRESHOLD:
+            log_event(logging.WARNING, "db.n_plus_one", route=route, repeats=repeats,
+                      statement=statement[:1000])
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        log_event(logging.WARNING, "http.slow_request", route=route, method=method,
+                  status=status, duration_ms=round(elapsed * 1000, 2),
+                  db_ms=round(stats.db_time * 1000, 2), queries=stats.queries,
+                  serialize_ms=round(stats.serialize_time * 1000, 2))
+    return elapsed
+
+
+@api.after_app_request
+def _finish_request_stats(response):
+    stats = current_stats()
+    if stats is None:
+        return response
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    method, status = request.method, response.status_code
+
+    if response.is_streamed:
+        # The body (and its queries) is produced after this hook returns;
+        # record once the server has consumed and closed it. No
+        # Server-Timing: headers are already on the wire by then.
+        response.call_on_close(lambda: _record_request(stats, route, method, status))
+        return response
+
+    elapsed = _record_request(stats, route, method, status)
+    response.headers["Server-Timing"] = "db;dur=%.2f, ser;dur=%.2f, total;dur=%.2f" % (
+        stats.db_time * 1000, stats.serialize_time * 1000, elapsed * 1000)
+    return response
+
+
+@api.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 # ----------------------------
 # MODEL
@@ -39,7 +300,7 @@ class Property(db.Model):
     google_maps_link = db.Column(db.String(1024))
     region = db.Column(db.String(128))
     main_image = db.Column(db.String(1024))
-    gallery_images = db.Column(db.Text)  # stored as JSON string
+    gallery_images = db.Column(db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
     furnished = db.Column(db.Boolean)
     parking = db.Column(db.Boolean)
     elevator = db.Column(db.Boolean)
@@ -48,46 +309,75 @@ class Property(db.Model):
     balcony = db.Column(db.Boolean)
     storage_room = db.Column(db.Boolean)
     sea_view = db.Column(db.Boolean)
-    floor = db.Column(db.String(64))
-    year_built = db.Column(db.String(64))
-    renovated_year = db.Column(db.String(64))
-    created_at = db.Column(db.String(64))
+    floor = db.Column(db.Integer)
+    year_built = db.Column(db.Integer)
+    renovated_year = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime(timezone=True))
     status = db.Column(db.String(64))
+    # Parsed from google_maps_link at ingest (see parse_coordinates)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+
+    # Composite indexes backing the listing filters + keyset pagination.
+    # (sort column, id) indexes serve "(col, id) > (:v, :id) ORDER BY col, id"
+    # as an index seek, read forwards for ascending and backwards for
+    # descending sorts (NULLs are paged separately, see fetch_page). The
+    # (column, id) indexes on equality filters serve
+    # "WHERE col = :v AND id > :cursor ORDER BY id" the same way; range
+    # filters (min_price, min_year, ...) are only index-backed when the
+    # listing is sorted by that same column.
+    __table_args__ = (
+        db.Index("ix_properties_listing", "transaction_type", "property_type", "city", "id"),
+        db.Index("ix_properties_city_id", "city", "id"),
+        db.Index("ix_properties_transaction_type_id", "transaction_type", "id"),
+        db.Index("ix_properties_property_type_id", "property_type", "id"),
+        db.Index("ix_properties_region_id", "region", "id"),
+        db.Index("ix_properties_price_id", "price", "id"),
+        db.Index("ix_properties_bedrooms_id", "bedrooms", "id"),
+        db.Index("ix_properties_created_at_id", "created_at", "id"),
+        db.Index("ix_properties_year_built_id", "year_built", "id"),
+        db.Index("ix_properties_lat_lng", "latitude", "longitude"),
+    )
 
-    def to_json(self):
-        return OrderedDict([
-            ("id", self.id),
-            ("title", self.title),
-            ("description", self.description),
-            ("transaction_type", self.transaction_type),
-            ("property_type", self.property_type),
-            ("price", self.price),
-            ("area_size", self.area_size),
-            ("bedrooms", self.bedrooms),
-            ("bathrooms", self.bathrooms),
-            ("region", self.region),
-            ("city", self.city),
-            ("google_maps_link", self.google_maps_link),
-            ("main_image", self.main_image),
-            ("gallery_images", json.loads(self.gallery_images) if self.gallery_images else []),
-            ("floor", self.floor),
-            ("furnished", self.furnished),
-            ("parking", self.parking),
-            ("elevator", self.elevator),
-            ("pets_allowed", self.pets_allowed),
-            ("air_conditioning", self.air_conditioning),
-            ("balcony", self.balcony),
-            ("storage_room", self.storage_room),
-            ("sea_view", self.sea_view),
-            ("year_built", self.year_built),
-            ("renovated_year", self.renovated_year),
-            ("created_at", self.created_at),
-            ("status", self.status),
-        ])
-
-# Create table if not exists
-with app.app_context():
+    def to_json(self, fields=None):
+        # `fields` restricts output to a projection; only the requested
+        # attributes are touched so columns left out by load_only() are
+        # never lazy-loaded.
+        data = OrderedDict()
+        for name in fields or JSON_FIELDS:
+            value = getattr(self, name)
+            dump = JSON_DUMPERS.get(name)
+            data[name] = dump(value) if dump else value
+        return data
+
+# Output order of Property.to_json()
+JSON_FIELDS = (
+    "id", "title", "description", "transaction_type", "property_type",
+    "price", "area_size", "bedrooms", "bathrooms", "region", "city",
+    "google_maps_link", "main_image", "gallery_images", "floor",
+    "furnished", "parking", "elevator", "pets_allowed", "air_conditioning",
+    "balcony", "storage_room", "sea_view", "year_built", "renovated_year",
+    "created_at", "status", "latitude", "longitude",
+)
+
+@api.cli.command("init-db")
+def init_db_command():
+    """Create missing tables, then apply pending schema migrations."""
+    import migrations
     db.create_all()
+    migrations.upgrade(db.engine, log=click.echo)
+    click.echo("Database initialized.")
+
+
+@api.cli.command("migrate")
+@click.option("--batch-size", default=1000, show_default=True,
+              help="Rows per backfill transaction.")
+def migrate_command(batch_size):
+    """Apply pending schema migrations."""
+    import migrations
+    applied = migrations.upgrade(db.engine, batch_size=batch_size, log=click.echo)
+    if not applied:
+        click.echo("Schema is up to date.")
 
 YES_NO_MAP = {
     "one": True,
@@ -124,60 +414,1274 @@ FIELD_MAPPING = {
 }
 
 # ----------------------------
-# POST HANDLER
+# FORM NORMALIZER
 # ----------------------------
-@app.route("/api/property", methods=["POST"])
-def create_property():
-    data = request.get_json()
-    print("Incoming data:", data)
+# Each column has a parser (form value -> stored value) and an optional
+# dumper (stored value -> JSON value used by Property.to_json). The
+# (form_key, column, parser) list is compiled once at import time.
+class FieldError(ValueError):
+    def __init__(self, field, message):
+        super().__init__("%s: %s" % (field, message))
+        self.field = field
+        self.message = message
 
-    normalized = {}
 
-    for form_key, model_key in FIELD_MAPPING.items():
-        if form_key not in data:
-            continue
+class InvalidRequest(ValueError):
+    """Bad query args or body; views answer it with a 400."""
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def to_text(value):
+    if value is None or type(value) is str:
+        return value
+    if isinstance(value, (dict, list)):
+        raise ValueError("expected text")
+    return str(value)
+
+
+# Radio values plus already-typed / empty inputs, resolved in one lookup
+BOOL_VALUES = dict(YES_NO_MAP, **{"": None})
+BOOL_VALUES.update({True: True, False: False, None: None})
+
+
+def to_bool(value):
+    try:
+        return BOOL_VALUES[value]
+    except (KeyError, TypeError):
+        raise ValueError("expected one of %s" % ", ".join(YES_NO_MAP))
+
+
+def to_float(value):
+    # Forminator sends numbers as strings; try the common case first
+    try:
+        if type(value) is str or type(value) is int or type(value) is float:
+            number = float(value)
+            if not math.isfinite(number):
+                raise ValueError
+            return number
+    except ValueError:
+        if _blank(value):
+            return None
+        raise ValueError("expected a number")
+    if value is None:
+        return None
+    raise ValueError("expected a number")
+
+
+# INTEGER columns are 32-bit on Postgres; larger values must fail here,
+# not as a driver error on insert
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def to_int(value):
+    number = to_float(value)
+    if number is None:
+        return None
+    if not number.is_integer():
+        raise ValueError("expected a whole number")
+    if not INT_MIN <= number <= INT_MAX:
+        raise ValueError("number out of range")
+    return int(number)
 
-        value = data[form_key]
 
-        # Boolean fields
-        if model_key in [
-            "furnished", "parking", "elevator", "pets_allowed",
-            "air_conditioning", "balcony", "storage_room", "sea_view"
-        ]:
-            normalized[model_key] = YES_NO_MAP.get(value, None)
+def to_year(value):
+    year = to_int(value)
+    if year is not None and not 1000 <= year <= 2100:
+        raise ValueError("expected a year")
+    return year
 
-        # Gallery images (multiple)
-        elif model_key == "gallery_images":
-            if "forminator_multifile_hidden" in data and "upload_2" in data["forminator_multifile_hidden"]:
-                files = data["forminator_multifile_hidden"]["upload_2"]
-                normalized[model_key] = json.dumps([f["file_name"] for f in files])
+
+def to_url(value):
+    url = (value if type(value) is str else "" if value is None else str(value)).strip()
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError("expected an http(s) URL")
+    return url
+
+
+def to_image_list(value):
+    # Plain file names, or Forminator multifile entries ({"file_name": ...})
+    if not isinstance(value, list):
+        return []
+    names = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get("file_name")
+        if not isinstance(item, str):
+            raise ValueError("expected a list of file names")
+        names.append(item)
+    return names
+
+
+def from_image_list(value):
+    return value or []
+
+
+# Accepted besides ISO 8601 (datetime.fromisoformat), including the
+# WordPress date_format / time_format choices ("October 17, 2026 3:05 pm")
+TIMESTAMP_FORMATS = (
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%d.%m.%Y",
+    "%B %d, %Y", "%B %d, %Y %I:%M %p", "%B %d, %Y %H:%M",
+    "%b %d, %Y", "%d %B %Y",
+)
+
+
+def to_timestamp(value):
+    """Parse a submission date; naive values are taken as UTC."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif _blank(value):
+        return None
+    elif not isinstance(value, str):
+        raise ValueError("expected a date")
+    else:
+        value = value.strip()
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            for fmt in TIMESTAMP_FORMATS:
+                try:
+                    parsed = datetime.strptime(value, fmt)
+                    break
+                except ValueError:
+                    pass
             else:
-                normalized[model_key] = json.dumps(value if isinstance(value, list) else [])
+                raise ValueError("expected a date")
+    if parsed.tzinfo is None:
+        # combine() is about 3x cheaper than replace(tzinfo=...) here
+        parsed = datetime.combine(parsed.date(), parsed.time(), timezone.utc)
+    return parsed
+
+
+def to_submission_timestamp(value):
+    """to_timestamp() for the form's submission date: an unrecognized date
+    is stored as NULL (and logged) rather than rejecting the listing, the
+    same outcome the 0001 backfill gives legacy rows.
+    """
+    try:
+        return to_timestamp(value)
+    except ValueError:
+        log_event(logging.WARNING, "property.unparsed_timestamp", value=str(value)[:100])
+        return None
+
+
+def from_timestamp(value):
+    return value.isoformat() if value is not None else None
+
+
+FieldType = namedtuple("FieldType", "parse dump")
+
+TEXT = FieldType(to_text, None)
+BOOL = FieldType(to_bool, None)
+
+FIELD_TYPES = {
+    "title": TEXT,
+    "description": TEXT,
+    "property_type": TEXT,
+    "transaction_type": TEXT,
+    "price": FieldType(to_float, None),
+    "area_size": FieldType(to_float, None),
+    "bathrooms": FieldType(to_int, None),
+    "bedrooms": FieldType(to_int, None),
+    "region": TEXT,
+    "google_maps_link": FieldType(to_url, None),
+    "city": TEXT,
+    "main_image": TEXT,
+    "gallery_images": FieldType(to_image_list, from_image_list),
+    "furnished": BOOL,
+    "parking": BOOL,
+    "elevator": BOOL,
+    "pets_allowed": BOOL,
+    "air_conditioning": BOOL,
+    "balcony": BOOL,
+    "storage_room": BOOL,
+    "sea_view": BOOL,
+    "floor": FieldType(to_int, None),
+    "year_built": FieldType(to_year, None),
+    "renovated_year": FieldType(to_year, None),
+    "created_at": FieldType(to_submission_timestamp, from_timestamp),
+    "status": TEXT,
+}
+
+GALLERY_FORM_KEY = "upload_2"
+
+# The gallery is handled separately: its value may come from a hidden field
+NORMALIZER = tuple(
+    (form_key, column, FIELD_TYPES[column].parse)
+    for form_key, column in FIELD_MAPPING.items()
+    if form_key != GALLERY_FORM_KEY
+)
+
+JSON_DUMPERS = {
+    column: field_type.dump
+    for column, field_type in FIELD_TYPES.items()
+    if field_type.dump is not None
+}
+
+# Google Maps URL shapes that carry coordinates, most specific first:
+# .../data=!3d37.9!4d23.6, .../@37.9,23.6,15z, ?q=37.9,23.6 (also ll= / query=)
+# Each pattern is paired with a literal it needs, checked with a cheap `in`
+# before running the regex.
+COORDINATE_PATTERNS = tuple((marker, re.compile(p)) for marker, p in (
+    ("!3d", r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)"),
+    ("@", r"@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)"),
+    ("=", r"[?&](?:q|ll|query|destination)=(-?\d+(?:\.\d+)?)(?:,|%2C)\s*(-?\d+(?:\.\d+)?)"),
+))
+
+
+def parse_coordinates(url):
+    """(latitude, longitude) from a Google Maps link, or (None, None).
+
+    Short links (maps.app.goo.gl) carry no coordinates and yield None.
+    """
+    if not url:
+        return None, None
+    for marker, pattern in COORDINATE_PATTERNS:
+        if marker not in url:
+            continue
+        match = pattern.search(url)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lng <= 180:
+                return lat, lng
+    return None, None
+
+
+# Columns written on ingest: the form fields plus values derived from them
+INGEST_COLUMNS = tuple(FIELD_MAPPING.values()) + ("latitude", "longitude")
+
+# ----------------------------
+# RESPONSE CACHE
+# ----------------------------
+# Read endpoints are cached as fully rendered responses. Every cache key
+# is prefixed with a "generation" number; a committed write to the
+# properties table bumps the generation, which orphans all previous
+# entries at once (they age out through the TTL / LRU eviction).
+#
+# CACHE_BACKEND=memory  per-process LRU + TTL (default)
+# CACHE_BACKEND=redis   shared between workers, needs CACHE_REDIS_URL
+# CACHE_BACKEND=local   the shared backend over an in-process stand-in
+# CACHE_BACKEND=none    disabled
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+# Bodies above this are served but never stored (a limit=500 page with
+# every column can run to several MB)
+CACHE_MAX_ENTRY_BYTES = int(os.getenv("CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+# Total body bytes a MemoryCache may hold, per worker
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def next_last_modified(previous):
+    """Last-Modified for a new generation, in whole seconds.
+
+    HTTP dates have one-second resolution, so the time is rounded up and
+    always moves at least one second past `previous`: a client holding the
+    old value never gets a 304 for the new generation.
+    """
+    now = math.ceil(time.time())
+    return now if previous is None else max(now, previous + 1)
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL, bounded both by entry
+    count and by the total size of the cached bodies.
+
+    Each gunicorn worker has its own copy, so a write only invalidates the
+    worker that handled it; the others catch up after CACHE_TTL seconds.
+    Use the shared backend when that staleness window matters.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._last_modified = next_last_modified(None)
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, value, size = item
+            if expires < time.time():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = len(value["body"])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (time.time() + self.ttl, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    def generation(self):
+        with self._lock:
+            return self._generation, self._last_modified
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._last_modified = next_last_modified(self._last_modified)
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SharedCache:
+    """Cache stored in a shared key/value server.
+
+    `client` only needs get/mget/set(ex=, nx=)/incr and transaction(), so
+    anything redis-py compatible works, including LocalKeyValueStore for
+    local runs.
+    """
+
+    prefix = "properties-cache:"
+
+    def __init__(self, client, ttl=CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._generation_key = self.prefix + "generation"
+        self._last_modified_key = self.prefix + "last_modified"
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def generation(self):
+        # One MGET, so a reader never pairs a new generation with an old time
+        generation, last_modified = self.client.mget(self._generation_key, self._last_modified_key)
+        if last_modified is None:
+            # First use: pin a start time that every worker agrees on
+            self.client.set(self._last_modified_key, next_last_modified(None), nx=True)
+            generation, last_modified = self.client.mget(self._generation_key, self._last_modified_key)
+        return int(generation or 0), int(last_modified)
+
+    def invalidate(self):
+        def bump(pipe):
+            previous = pipe.get(self._last_modified_key)
+            pipe.multi()
+            pipe.incr(self._generation_key)
+            pipe.set(self._last_modified_key,
+                     next_last_modified(int(previous) if previous is not None else None))
+
+        # WATCH + MULTI: both keys change together, and a concurrent bump
+        # retries so every generation gets a later Last-Modified.
+        self.client.transaction(bump, self._generation_key, self._last_modified_key)
+
+
+class LocalKeyValueStore:
+    """In-process stand-in for the redis client used by SharedCache.
+
+    Implements just get / mget / set(ex=, nx=) / incr / transaction with
+    redis semantics, so the shared backend can be exercised without a
+    server (CACHE_BACKEND=local). Transactions hold the store lock, so
+    they never need to retry.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.RLock()
+
+    def _live(self, key):
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] < time.time():
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key):
+        with self._lock:
+            item = self._live(key)
+            return item[0].encode() if item is not None else None
+
+    def mget(self, *keys):
+        with self._lock:
+            return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            self._data[key] = (str(value), time.time() + ex if ex else None)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            item = self._live(key)
+            value = int(item[0]) + 1 if item is not None else 1
+            self._data[key] = (str(value), item[1] if item is not None else None)
+            return value
+
+    def transaction(self, func, *watches):
+        with self._lock:
+            pipe = _LocalPipeline(self)
+            func(pipe)
+            return pipe.execute()
+
+
+class _LocalPipeline:
+    # Immediate until multi(), then queued until execute(), like redis-py
+    def __init__(self, store):
+        self._store = store
+        self._queue = None
+
+    def multi(self):
+        self._queue = []
+
+    def execute(self):
+        queued, self._queue = self._queue or [], None
+        return [getattr(self._store, name)(*args, **kwargs) for name, args, kwargs in queued]
+
+    def __getattr__(self, name):
+        command = getattr(self._store, name)
+
+        def call(*args, **kwargs):
+            if self._queue is None:
+                return command(*args, **kwargs)
+            self._queue.append((name, args, kwargs))
+            return self
+        return call
+
+
+def make_cache():
+    backend = os.getenv("CACHE_BACKEND", "memory")
+    if backend == "none":
+        return None
+    if backend == "redis":
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        return SharedCache(redis.Redis.from_url(os.getenv("CACHE_REDIS_URL")))
+    if backend == "local":
+        return SharedCache(LocalKeyValueStore())
+    return MemoryCache()
+
+
+response_cache = make_cache()
+
+# Response headers that are part of the cached representation
+CACHED_HEADERS = ("X-Next-Cursor", "Link")
+
 
+def cached_response(view):
+    """Serve `view` from response_cache with strong ETag / Last-Modified.
+
+    Only 200 responses up to CACHE_MAX_ENTRY_BYTES are stored. Conditional
+    requests (If-None-Match, If-Modified-Since) are answered with 304 on
+    hits and misses alike.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if response_cache is None:
+            return view(*args, **kwargs)
+
+        generation, last_modified = response_cache.generation()
+        # Scheme and host are part of the key: the cached Link header is absolute
+        key = "%d:%s" % (generation, request.url)
+        entry = response_cache.get(key)
+
+        if entry is None:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            headers = {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers}
+            # Pagination headers are hashed too: same page, different cursor
+            # is a different representation.
+            digest = hashlib.sha1(body)
+            digest.update(json.dumps(headers, sort_keys=True).encode())
+            entry = {
+                "body": body.decode("utf-8"),
+                "mimetype": response.mimetype,
+                "etag": digest.hexdigest(),
+                "last_modified": last_modified,
+                "headers": headers,
+            }
+            if len(body) <= CACHE_MAX_ENTRY_BYTES:
+                response_cache.set(key, entry)
         else:
-            normalized[model_key] = value
+            response = Response(entry["body"], mimetype=entry["mimetype"])
+            response.headers.update(entry["headers"])
+
+        response.set_etag(entry["etag"])
+        response.last_modified = entry["last_modified"]
+        return response.make_conditional(request)
+    return wrapper
+
+
+@event.listens_for(Session, "after_flush")
+def _track_property_writes(session, flush_context):
+    if any(isinstance(obj, Property) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["properties_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_property_writes(orm_execute_state):
+    # ORM-enabled insert/update/delete statements bypass the flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is Property:
+            orm_execute_state.session.info["properties_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_response_cache(session):
+    if session.info.pop("properties_changed", False) and response_cache is not None:
+        response_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_property_writes(session):
+    session.info.pop("properties_changed", None)
+
+# ----------------------------
+# POST HANDLER
+# ----------------------------
+_MISSING = object()
+
+
+def normalize_fields(data):
+    """Map the form fields of a Forminator payload onto Property columns.
+
+    Raises FieldError for values that do not fit their column.
+    """
+    if not isinstance(data, dict):
+        raise FieldError("payload", "expected a JSON object")
+
+    normalized = {}
+    for form_key, column, parse in NORMALIZER:
+        value = data.get(form_key, _MISSING)
+        if value is _MISSING:
+            continue
+        try:
+            normalized[column] = parse(value)
+        except ValueError as e:
+            raise FieldError(column, str(e))
+
+    if GALLERY_FORM_KEY in data:
+        value = data[GALLERY_FORM_KEY]
+        # Multi-file uploads carry the real file list in a hidden field
+        hidden = data.get("forminator_multifile_hidden")
+        if isinstance(hidden, dict) and GALLERY_FORM_KEY in hidden:
+            value = hidden[GALLERY_FORM_KEY]
+        try:
+            normalized["gallery_images"] = to_image_list(value)
+        except ValueError as e:
+            raise FieldError("gallery_images", str(e))
+    return normalized
+
+
+def normalize_submission(data):
+    """normalize_fields() plus the columns derived from them."""
+    normalized = normalize_fields(data)
+    if "google_maps_link" in normalized:
+        normalized["latitude"], normalized["longitude"] = parse_coordinates(
+            normalized["google_maps_link"]
+        )
+
+    return normalized
+
+
+@api.route("/api/property", methods=["POST"])
+def create_property():
+    data = request.get_json()
+    if random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+        log_event(logging.INFO, "property.submission_sample", payload=data)
+
+    try:
+        normalized = normalize_submission(data)
+    except FieldError as e:
+        return jsonify({"success": False, "field": e.field, "error": e.message}), 400
 
     prop = Property(**normalized)
     db.session.add(prop)
     db.session.commit()
 
+    log_event(logging.INFO, "property.created", id=prop.id, fields=len(normalized))
     return jsonify({"success": True, "id": prop.id})
 
+# ----------------------------
+# BULK POST HANDLER
+# ----------------------------
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+BULK_MAX_CHUNK_SIZE = 5000
+# Items accepted per request; larger batches should be split by the client
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+
+def read_bulk_body():
+    """Payloads from a JSON array body or an NDJSON body.
+
+    Returns a list of (payload, error) pairs so a malformed NDJSON line
+    only fails its own item.
+    """
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((json.loads(line), None))
+            except ValueError:
+                items.append((None, "invalid JSON"))
+        return items
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise InvalidRequest("expected a JSON array or an NDJSON body")
+    return [(item, None) for item in data]
+
+
+def insert_rows(rows):
+    """INSERT ... RETURNING id for `rows`, one executemany per call.
+
+    SQLAlchemy batches this through insertmanyvalues; returned ids come
+    back in parameter order.
+    """
+    stmt = db.insert(Property).returning(Property.id, sort_by_parameter_order=True)
+    return db.session.execute(stmt, rows).scalars().all()
+
+
+# Errors a single bad row can cause: database errors, plus driver bind
+# errors that are raised as plain Python exceptions (e.g. sqlite3 raises
+# OverflowError for integers beyond 64 bits)
+ROW_ERRORS = (db.exc.SQLAlchemyError, OverflowError, TypeError, ValueError)
+
+
+def row_error(e):
+    """Short client-facing message for a failed row insert; the driver
+    message (which may quote row values or schema details) is only logged.
+    """
+    if isinstance(e, db.exc.IntegrityError):
+        return "constraint violation"
+    if isinstance(e, (db.exc.DataError, OverflowError)):
+        return "value out of range for its column"
+    if isinstance(e, (TypeError, ValueError)):
+        return "invalid value for its column"
+    return "database error"
+
+
+@api.route("/api/properties/bulk", methods=["POST"])
+def bulk_create_properties():
+    """Insert many Forminator submissions in one request.
+
+    Body: a JSON array of payloads, or NDJSON (Content-Type:
+    application/x-ndjson). ?chunk_size= controls how many rows go into one
+    batched INSERT and one commit (default BULK_CHUNK_SIZE).
+
+    A chunk that fails in the database is retried row by row inside
+    savepoints, so a bad record only fails itself. The response lists an
+    id or an error for every input item, in input order. Bodies with more
+    than BULK_MAX_ITEMS items are rejected with 413.
+    """
+    try:
+        items = read_bulk_body()
+        try:
+            chunk_size = int(request.args.get("chunk_size", BULK_CHUNK_SIZE))
+        except ValueError:
+            raise InvalidRequest("invalid chunk_size")
+    except InvalidRequest as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    if len(items) > BULK_MAX_ITEMS:
+        return jsonify({
+            "success": False,
+            "error": "at most %d items per request" % BULK_MAX_ITEMS,
+        }), 413
+    chunk_size = max(1, min(chunk_size, BULK_MAX_CHUNK_SIZE))
+
+    columns = INGEST_COLUMNS
+    results = [None] * len(items)
+    pending = []  # (index, row)
+
+    for index, (payload, error) in enumerate(items):
+        if error is None:
+            try:
+                normalized = normalize_submission(payload)
+            except FieldError as e:
+                error = str(e)
+        if error is not None:
+            results[index] = {"index": index, "error": error}
+            continue
+        # Same key set on every row keeps the executemany a single batch.
+        pending.append((index, {c: normalized.get(c) for c in columns}))
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            with db.session.begin_nested():
+                ids = insert_rows([row for _, row in chunk])
+            for (index, _), new_id in zip(chunk, ids):
+                results[index] = {"index": index, "id": new_id}
+        except ROW_ERRORS:
+            for index, row in chunk:
+                try:
+                    with db.session.begin_nested():
+                        (new_id,) = insert_rows([row])
+                    results[index] = {"index": index, "id": new_id}
+                except ROW_ERRORS as e:
+                    log_event(logging.WARNING, "property.bulk_row_failed", index=index,
+                              error=str(getattr(e, "orig", None) or e).strip())
+                    results[index] = {"index": index, "error": row_error(e)}
+        db.session.commit()
+
+    inserted = sum(1 for r in results if "id" in r)
+    return jsonify({
+        "success": True,
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results,
+    })
+
 # ----------------------------
 # GET ALL
 # ----------------------------
-@app.route("/api/properties")
+DEFAULT_PAGE_SIZE = int(os.getenv("PROPERTIES_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("PROPERTIES_MAX_PAGE_SIZE", "500"))
+
+def cursor_int(value):
+    if type(value) is not int:
+        raise ValueError("expected an integer")
+    return value
+
+
+def cursor_number(value):
+    if type(value) not in (int, float) or not math.isfinite(value):
+        raise ValueError("expected a number")
+    return value
+
+
+def cursor_timestamp(value):
+    if not isinstance(value, str):
+        raise ValueError("expected a timestamp")
+    return to_timestamp(value)
+
+
+# sort key -> (column value -> cursor value, cursor value -> column value)
+# The second function validates the decoded cursor; it raises ValueError.
+SORT_KEYS = {
+    "id": (None, cursor_int),
+    "created_at": (from_timestamp, cursor_timestamp),
+    "price": (None, cursor_number),
+    "year_built": (None, cursor_int),
+}
+
+# query arg -> (column, operator, converter)
+LIST_FILTERS = {
+    "city": ("city", "eq", str),
+    "region": ("region", "eq", str),
+    "transaction_type": ("transaction_type", "eq", str),
+    "property_type": ("property_type", "eq", str),
+    "min_price": ("price", "ge", float),
+    "max_price": ("price", "le", float),
+    "bedrooms": ("bedrooms", "eq", int),
+    "min_bedrooms": ("bedrooms", "ge", int),
+    "max_bedrooms": ("bedrooms", "le", int),
+    "min_year": ("year_built", "ge", int),
+    "max_year": ("year_built", "le", int),
+    "created_after": ("created_at", "ge", to_timestamp),
+    "created_before": ("created_at", "le", to_timestamp),
+}
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidRequest("invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidRequest("invalid cursor")
+    return values
+
+
+def parse_fields(raw):
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in JSON_FIELDS]
+    if unknown:
+        raise InvalidRequest("unknown fields: " + ", ".join(unknown))
+    return fields
+
+
+def apply_filters(query, args):
+    for arg, (column, op, convert) in LIST_FILTERS.items():
+        raw = args.get(arg)
+        if raw is None or raw == "":
+            continue
+        try:
+            value = convert(raw)
+        except ValueError:
+            raise InvalidRequest("invalid value for %s" % arg)
+        col = getattr(Property, column)
+        if op == "eq":
+            query = query.filter(col == value)
+        elif op == "ge":
+            query = query.filter(col >= value)
+        else:
+            query = query.filter(col <= value)
+    return query
+
+
+def fetch_page(query, sort, descending, cursor, limit):
+    """Up to `limit` rows ordered by (sort, id), strictly after `cursor`.
+
+    Each step is a plain row-value range, so it is an index seek on
+    (sort, id) however deep the page:
+
+      1. rows with a non-null sort value: (col, id) > (v, id) ORDER BY col, id
+      2. then the NULL tail: col IS NULL AND id > :id ORDER BY id
+
+    The cursor carries a null sort value once the walk reaches step 2.
+    """
+    id_col = Property.id
+    if sort == "id":
+        if cursor is not None:
+            (last_id,) = cursor
+            query = query.filter(id_col < last_id if descending else id_col > last_id)
+        return query.order_by(id_col.desc() if descending else id_col.asc()).limit(limit).all()
+
+    col = getattr(Property, sort)
+    last_value, last_id = cursor if cursor is not None else (None, None)
+    rows = []
+
+    if cursor is None or last_value is not None:
+        values = query.filter(col.isnot(None))
+        if cursor is not None:
+            key, after = tuple_(col, id_col), tuple_(last_value, last_id)
+            values = values.filter(key < after if descending else key > after)
+        if descending:
+            values = values.order_by(col.desc(), id_col.desc())
+        else:
+            values = values.order_by(col.asc(), id_col.asc())
+        rows = values.limit(limit).all()
+        if len(rows) == limit:
+            return rows
+        last_id = None
+
+    nulls = query.filter(col.is_(None))
+    if last_id is not None:
+        nulls = nulls.filter(id_col < last_id if descending else id_col > last_id)
+    nulls = nulls.order_by(id_col.desc() if descending else id_col.asc())
+    return rows + nulls.limit(limit - len(rows)).all()
+
+
+@api.route("/api/properties")
+@cached_response
 def list_properties():
-    result = [p.to_json() for p in Property.query.all()]
+    """One page of properties.
+
+    Query args:
+      limit     page size (default PROPERTIES_PAGE_SIZE, capped at PROPERTIES_MAX_PAGE_SIZE)
+      cursor    opaque value from the previous page's X-Next-Cursor header
+      sort      id | created_at | price | year_built, "-" prefix for descending
+      fields    comma separated projection, e.g. fields=id,title,price
+      + any of LIST_FILTERS
+
+    The body stays a plain JSON array; the next page is advertised through
+    the X-Next-Cursor and Link headers and is absent on the last page.
+    """
+    args = request.args
+    try:
+        try:
+            limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise InvalidRequest("invalid limit")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        sort = args.get("sort", "id")
+        descending = sort.startswith("-")
+        sort = sort[1:] if descending else sort
+        if sort not in SORT_KEYS:
+            raise InvalidRequest("invalid sort")
+
+        cursor = args.get("cursor")
+        if cursor:
+            cursor = decode_cursor(cursor)
+            if len(cursor) != (1 if sort == "id" else 2):
+                raise InvalidRequest("invalid cursor")
+            try:
+                cursor[-1] = cursor_int(cursor[-1])
+                if sort != "id" and cursor[0] is not None:
+                    cursor[0] = SORT_KEYS[sort][1](cursor[0])
+            except ValueError:
+                raise InvalidRequest("invalid cursor")
+        else:
+            cursor = None
+
+        fields = parse_fields(args.get("fields"))
+        query = apply_filters(Property.query, args)
+    except InvalidRequest as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if fields is not None:
+        # Sort keys are always loaded so the next cursor can be built.
+        load = set(fields) | {"id", sort}
+        query = query.options(db.load_only(*[getattr(Property, f) for f in load]))
+
+    # Fetch one extra row to know whether another page exists.
+    rows = fetch_page(query, sort, descending, cursor, limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    response = jsonify([p.to_json(fields) for p in rows])
+    if has_more:
+        last = rows[-1]
+        if sort == "id":
+            next_cursor = encode_cursor([last.id])
+        else:
+            to_cursor = SORT_KEYS[sort][0]
+            value = getattr(last, sort)
+            if to_cursor is not None:
+                value = to_cursor(value)
+            next_cursor = encode_cursor([value, last.id])
+        params = args.to_dict()
+        params["cursor"] = next_cursor
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = '<%s>; rel="next"' % (
+            request.base_url + "?" + urlencode(params)
+        )
+    return response
+
+# ----------------------------
+# SEARCH
+# ----------------------------
+# On Postgres, full-text search runs against the generated `search_vector`
+# tsvector column and its GIN index (added by migrations.py, not by
+# create_all). Other databases fall back to LIKE matching with the same
+# response shape, so the endpoint also works on a local SQLite file.
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "simple")
+SEARCH_MAX_OFFSET = 1000
+KM_PER_DEGREE = 111.32
+
+# Fallback weights, mirroring setweight() A/B/C on Postgres
+SEARCH_WEIGHTS = (("title", 3), ("region", 2), ("description", 1))
+HIGHLIGHT_CONTEXT = 80
+
+
+def search_terms(q):
+    return [t for t in re.split(r"\W+", q.lower()) if t][:10]
+
+
+def like_pattern(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return "%" + escaped + "%"
+
+
+def highlight(text, terms, snippet=False):
+    """HTML-escaped `text` with matched terms wrapped in <b></b>.
+
+    Listing text comes from public form submissions, so everything but the
+    <b> tags is escaped.
+    """
+    if not text:
+        return text
+    if not terms:
+        return html.escape(text)
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return html.escape(text[:2 * HIGHLIGHT_CONTEXT] if snippet else text)
+    if snippet:
+        start = max(0, match.start() - HIGHLIGHT_CONTEXT)
+        text = text[start:match.end() + HIGHLIGHT_CONTEXT]
+    out, pos = [], 0
+    for m in pattern.finditer(text):
+        out.append(html.escape(text[pos:m.start()]))
+        out.append("<b>%s</b>" % html.escape(m.group(0)))
+        pos = m.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out)
+
+
+# ts_headline marks matches with these private-use characters; the result
+# is HTML-escaped in Python and only then are the markers turned into tags.
+HEADLINE_START, HEADLINE_STOP = "\ue000", "\ue001"
+
+
+def headline_expr(column, tsquery, options):
+    # Strip marker characters from the stored text so they cannot forge tags
+    text = func.translate(func.coalesce(column, ""), HEADLINE_START + HEADLINE_STOP, "")
+    options = "StartSel=%s, StopSel=%s, %s" % (HEADLINE_START, HEADLINE_STOP, options)
+    return func.ts_headline(SEARCH_LANGUAGE, text, tsquery, options)
+
+
+def render_headline(value):
+    if value is None:
+        return None
+    return (html.escape(value)
+            .replace(HEADLINE_START, "<b>")
+            .replace(HEADLINE_STOP, "</b>"))
+
+
+def parse_geo(args):
+    """Geo constraints from ?lat=&lng=&radius_km= and/or ?bbox=.
+
+    bbox is min_lng,min_lat,max_lng,max_lat. Returns (center, radius_km,
+    bbox), each None when not requested.
+    """
+    center = radius = bbox = None
+    try:
+        if args.get("lat") or args.get("lng"):
+            center = (float(args["lat"]), float(args["lng"]))
+            radius = float(args.get("radius_km", "5"))
+            if not (-90 <= center[0] <= 90 and -180 <= center[1] <= 180) or radius <= 0:
+                raise ValueError
+        if args.get("bbox"):
+            bbox = [float(v) for v in args["bbox"].split(",")]
+            if len(bbox) != 4:
+                raise ValueError
+    except (KeyError, ValueError):
+        raise InvalidRequest("invalid geo parameters")
+    return center, radius, bbox
+
+
+def distance_expr(center):
+    """Squared distance in km² on an equirectangular projection.
+
+    Plain arithmetic (no trig in SQL), accurate to well under 1% at city
+    scale, and portable to SQLite.
+    """
+    lat, lng = center
+    lng_scale = KM_PER_DEGREE * math.cos(math.radians(lat))
+    dy = (Property.latitude - lat) * KM_PER_DEGREE
+    dx = (Property.longitude - lng) * lng_scale
+    return dy * dy + dx * dx
+
+
+def apply_geo(query, center, radius, bbox):
+    if center is not None:
+        # Bounding box first so the (latitude, longitude) index is used
+        lat, lng = center
+        dlat = radius / KM_PER_DEGREE
+        dlng = radius / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        query = query.filter(
+            Property.latitude.between(lat - dlat, lat + dlat),
+            Property.longitude.between(lng - dlng, lng + dlng),
+            distance_expr(center) <= radius * radius,
+        )
+    if bbox is not None:
+        min_lng, min_lat, max_lng, max_lat = bbox
+        query = query.filter(
+            Property.latitude.between(min_lat, max_lat),
+            Property.longitude.between(min_lng, max_lng),
+        )
+    return query
+
+
+@api.route("/api/properties/search")
+@cached_response
+def search_properties():
+    """Full-text and geo search.
+
+    Query args:
+      q              free text over title / description / region
+      lat, lng       radius search center, with radius_km (default 5)
+      bbox           min_lng,min_lat,max_lng,max_lat
+      limit, offset  paging (offset capped at SEARCH_MAX_OFFSET)
+      fields         projection, as for /api/properties
+      + any of LIST_FILTERS
+
+    Results are ordered by rank when q is given, else by distance when a
+    center is given, else by id. Each item gets a "search" object with
+    rank, distance_km and HTML-escaped, <b>-highlighted title / description.
+    """
+    args = request.args
+    try:
+        q = args.get("q", "").strip()
+        center, radius, bbox = parse_geo(args)
+        if not q and center is None and bbox is None:
+            raise InvalidRequest("q, lat/lng or bbox is required")
+        try:
+            limit = max(1, min(int(args.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+            offset = max(0, min(int(args.get("offset", 0)), SEARCH_MAX_OFFSET))
+        except ValueError:
+            raise InvalidRequest("invalid limit or offset")
+        fields = parse_fields(args.get("fields"))
+        query = apply_filters(Property.query, args)
+    except InvalidRequest as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    postgres = db.engine.dialect.name == "postgresql"
+    query = apply_geo(query, center, radius, bbox)
+    if fields is not None:
+        load = set(fields) | {"id"}
+        if q and not postgres:
+            load |= {"title", "description"}  # highlighted in Python
+        query = query.options(db.load_only(*[getattr(Property, f) for f in load]))
+
+    terms = search_terms(q)
+    rank = headline_title = headline_description = None
+
+    if q and postgres:
+        tsquery = func.websearch_to_tsquery(SEARCH_LANGUAGE, q)
+        vector = literal_column("search_vector")
+        rank = func.ts_rank_cd(vector, tsquery)
+        headline_title = headline_expr(Property.title, tsquery, "HighlightAll=true")
+        headline_description = headline_expr(Property.description, tsquery, "MaxWords=35")
+        query = query.filter(vector.op("@@")(tsquery))
+    elif q and not terms:
+        # Nothing searchable in q: only the geo constraints (if any) apply
+        if center is None and bbox is None:
+            return jsonify([])
+    elif q:
+        rank = 0
+        for term in terms:
+            pattern = like_pattern(term)
+            matches = [getattr(Property, c).ilike(pattern, escape="\\") for c, _ in SEARCH_WEIGHTS]
+            query = query.filter(or_(*matches))
+            for match, (_, weight) in zip(matches, SEARCH_WEIGHTS):
+                rank = rank + case((match, weight), else_=0)
+
+    extra = []
+    if rank is not None:
+        extra.append(rank.label("search_rank"))
+        query = query.order_by(literal_column("search_rank").desc(), Property.id)
+    elif center is not None:
+        query = query.order_by(distance_expr(center), Property.id)
+    else:
+        query = query.order_by(Property.id)
+    if center is not None:
+        extra.append(distance_expr(center).label("distance_sq"))
+    if headline_title is not None:
+        extra += [headline_title.label("headline_title"), headline_description.label("headline_description")]
+
+    if extra:
+        query = query.add_columns(*extra)
+
+    result = []
+    for row in query.limit(limit).offset(offset).all():
+        prop, mapping = (row[0], row._mapping) if extra else (row, {})
+        data = prop.to_json(fields)
+        info = OrderedDict()
+        if "search_rank" in mapping:
+            info["rank"] = round(float(mapping["search_rank"]), 6)
+        if "distance_sq" in mapping:
+            info["distance_km"] = round(math.sqrt(mapping["distance_sq"]), 3)
+        if q:
+            if "headline_title" in mapping:
+                info["highlight"] = {
+                    "title": render_headline(mapping["headline_title"]),
+                    "description": render_headline(mapping["headline_description"]),
+                }
+            else:
+                info["highlight"] = {
+                    "title": highlight(prop.title, terms),
+                    "description": highlight(prop.description, terms, snippet=True),
+                }
+        data["search"] = info
+        result.append(data)
     return jsonify(result)
 
+# ----------------------------
+# EXPORT (STREAMING)
+# ----------------------------
+EXPORT_BATCH_SIZE = int(os.getenv("PROPERTIES_EXPORT_BATCH_SIZE", "1000"))
+
+
+@api.route("/api/properties/export")
+def export_properties():
+    """Full dump of the properties table, streamed row by row.
+
+    ?format=ndjson (default) emits one JSON object per line,
+    ?format=json emits a single JSON array written out incrementally.
+    Accepts the same filters and fields= projection as /api/properties.
+
+    Rows are read through a server-side cursor (yield_per) in batches of
+    PROPERTIES_EXPORT_BATCH_SIZE, so worker memory does not grow with the
+    size of the table.
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "json"):
+        return jsonify({"success": False, "error": "invalid format"}), 400
+
+    try:
+        fields = parse_fields(request.args.get("fields"))
+        query = apply_filters(Property.query, request.args)
+    except InvalidRequest as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if fields is not None:
+        query = query.options(db.load_only(*[getattr(Property, f) for f in fields]))
+    query = query.order_by(Property.id).yield_per(EXPORT_BATCH_SIZE)
+
+    def dumps(prop):
+        return json.dumps(prop.to_json(fields), separators=(",", ":"), default=str)
+
+    def generate_ndjson():
+        for prop in query:
+            yield dumps(prop) + "\n"
+
+    def generate_json():
+        yield "["
+        first = True
+        for prop in query:
+            yield dumps(prop) if first else "," + dumps(prop)
+            first = False
+        yield "]"
+
+    if fmt == "ndjson":
+        body, mimetype = generate_ndjson(), "application/x-ndjson"
+    else:
+        body, mimetype = generate_json(), "application/json"
+    return Response(stream_with_context(body), mimetype=mimetype)
+
 # ----------------------------
 # GET ONE
 # ----------------------------
-@app.route("/api/property/<int:id>")
+@api.route("/api/property/<int:id>")
+@cached_response
 def get_property(id):
     prop = Property.query.get_or_404(id)
     return jsonify(prop.to_json())
 
+# ----------------------------
+# APP FACTORY
+# ----------------------------
+def create_app(config=None):
+    """Build the Flask app. Cheap: no connection is opened and no DDL runs.
+
+    `config` overrides settings, e.g. {"SQLALCHEMY_DATABASE_URI": ...}.
+    """
+    app = Flask(__name__)
+    app.json = TimedJSONProvider(app)
+
+    app.config['JSON_SORT_KEYS'] = False
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url()
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config.update(config or {})
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+    )
+
+    db.init_app(app)
+    app.register_blueprint(api)
+    return app
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
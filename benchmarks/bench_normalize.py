@@ -0,0 +1,104 @@
+"""Per-payload cost of Forminator form normalization.
+
+Compares the original per-request FIELD_MAPPING scan (copied below as
+`legacy_normalize`) with the compiled `app.normalize_fields`, which does
+the same mapping plus type validation. Deriving coordinates from the maps
+link has no legacy counterpart, so `parse_coordinates` is timed on its own
+and the full `normalize_submission` is listed for reference.
+
+    python benchmarks/bench_normalize.py [--number N]
+
+No database is touched.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import (  # noqa: E402
+    FIELD_MAPPING, YES_NO_MAP, normalize_fields, normalize_submission, parse_coordinates,
+)
+
+PAYLOAD = {
+    "text_1": "Sea view apartment",
+    "textarea_2": "Bright two bedroom flat close to the port.",
+    "radio_1": "apartment",
+    "radio_2": "sale",
+    "currency_1": "185000",
+    "number_1": "82.5",
+    "number_2": "1",
+    "number_3": "2",
+    "textarea_3": "Attica",
+    "url_1": "https://maps.google.com/?q=37.94,23.64",
+    "text_2": "Piraeus",
+    "upload_1": "https://example.com/uploads/main.jpg",
+    "upload_2": "",
+    "forminator_multifile_hidden": {
+        "upload_2": [{"file_name": "a.jpg"}, {"file_name": "b.jpg"}, {"file_name": "c.jpg"}],
+    },
+    "radio_3": "one",
+    "radio_4": "two",
+    "radio_5": "one",
+    "radio_6": "two",
+    "radio_7": "one",
+    "radio_8": "one",
+    "radio_9": "two",
+    "radio_10": "one",
+    "number_4": "3",
+    "number_5": "1998",
+    "number_6": "2019",
+    "hidden_2": "2024-05-01 10:00:00",
+    "hidden_3": "published",
+}
+
+
+def legacy_normalize(data):
+    normalized = {}
+
+    for form_key, model_key in FIELD_MAPPING.items():
+        if form_key not in data:
+            continue
+
+        value = data[form_key]
+
+        if model_key in [
+            "furnished", "parking", "elevator", "pets_allowed",
+            "air_conditioning", "balcony", "storage_room", "sea_view"
+        ]:
+            normalized[model_key] = YES_NO_MAP.get(value, None)
+
+        elif model_key == "gallery_images":
+            if "forminator_multifile_hidden" in data and "upload_2" in data["forminator_multifile_hidden"]:
+                files = data["forminator_multifile_hidden"]["upload_2"]
+                normalized[model_key] = json.dumps([f["file_name"] for f in files])
+            else:
+                normalized[model_key] = json.dumps(value if isinstance(value, list) else [])
+
+        else:
+            normalized[model_key] = value
+
+    return normalized
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = (
+        ("legacy", legacy_normalize, PAYLOAD),
+        ("compiled", normalize_fields, PAYLOAD),
+        ("coordinates", parse_coordinates, PAYLOAD["url_1"]),
+        ("submission", normalize_submission, PAYLOAD),
+    )
+    for name, func, arg in runs:
+        best = min(timeit.repeat(lambda: func(arg), number=args.number, repeat=args.repeat))
+        print("%-12s %8.2f us/payload" % (name, best / args.number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Cold-start cost: import -> create_app() -> first request.
+
+Each run is a fresh interpreter. Fails (exit 1) if importing app.py or
+calling create_app() opens a database connection or executes SQL.
+
+    python benchmarks/bench_startup.py [--runs N] [--database-url URL]
+
+By default a temporary SQLite file is initialized with
+`flask --app app init-db` so the first request has a table to read. When
+psycopg2 is installed, an extra check builds the app against an
+unreachable Postgres to make sure a DB outage cannot crash worker boot.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+counts = {"connects": 0, "statements": 0}
+event.listen(Pool, "connect", lambda *a: counts.__setitem__("connects", counts["connects"] + 1))
+event.listen(Engine, "before_cursor_execute", lambda *a: counts.__setitem__("statements", counts["statements"] + 1))
+
+import app
+t_import = time.perf_counter()
+flask_app = app.create_app()
+t_create = time.perf_counter()
+boot = dict(counts)
+
+first = None
+if sys.argv[1] == "request":
+    response = flask_app.test_client().get("/api/properties?limit=1")
+    first = response.status_code
+t_request = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1000,
+    "create_app_ms": (t_create - t_import) * 1000,
+    "first_request_ms": (t_request - t_create) * 1000,
+    "total_ms": (t_request - t0) * 1000,
+    "boot_connects": boot["connects"],
+    "boot_statements": boot["statements"],
+    "status": first,
+}))
+"""
+
+
+def child(database_url, mode):
+    env = dict(os.environ, DATABASE_URL=database_url, CACHE_BACKEND="none")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def check_no_db_on_boot(result, label):
+    if result["boot_connects"] or result["boot_statements"]:
+        print("FAIL %s: import/create_app made %d connection(s) and %d statement(s)"
+              % (label, result["boot_connects"], result["boot_statements"]))
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "startup.sqlite")
+        database_url = "sqlite:///" + path
+        subprocess.run(
+            [sys.executable, "-m", "flask", "--app", "app", "init-db"], cwd=ROOT,
+            env=dict(os.environ, DATABASE_URL=database_url), check=True, capture_output=True,
+        )
+
+    results = []
+    for _ in range(args.runs):
+        result = child(database_url, "request")
+        check_no_db_on_boot(result, database_url)
+        if result["status"] != 200:
+            print("FAIL first request returned %s" % result["status"])
+            sys.exit(1)
+        results.append(result)
+
+    for key in ("import_ms", "create_app_ms", "first_request_ms", "total_ms"):
+        values = [r[key] for r in results]
+        print("%-17s median %8.2f ms   min %8.2f ms" % (key, statistics.median(values), min(values)))
+    print("import + create_app: 0 connections, 0 statements")
+
+    try:
+        import psycopg2  # noqa: F401
+    except ImportError:
+        print("unreachable-Postgres boot check skipped (psycopg2 not installed)")
+        return
+    result = child("postgresql://nobody@127.0.0.1:1/unreachable", "boot")
+    check_no_db_on_boot(result, "unreachable Postgres")
+    print("boot with unreachable Postgres: ok (%.2f ms)" % (result["import_ms"] + result["create_app_ms"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Load test the API under different gunicorn worker configurations.
+
+For each configuration a gunicorn server is started with gunicorn.conf.py
+and the matching environment, hammered by concurrent keep-alive clients
+for a fixed duration, then stopped. Prints req/s, p50 and p99 latency.
+
+    python benchmarks/load_test.py                      # SQLite file in /tmp
+    python benchmarks/load_test.py --database-url postgresql://localhost/props
+    python benchmarks/load_test.py --configs sync,gthread --concurrency 32
+
+The response cache is disabled by default so the numbers reflect the
+database and worker model; pass --cache to measure with it on.
+"""
+import argparse
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# name -> gunicorn.conf.py environment
+CONFIGS = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync"},
+    "gthread": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "4"},
+    "gthread-8": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "8"},
+    "gevent": {"GUNICORN_WORKER_CLASS": "gevent", "GUNICORN_CONNECTIONS": "100"},
+}
+
+PATHS = (
+    "/api/properties?limit=20",
+    "/api/properties?limit=20&city=Athens&min_price=100000",
+    "/api/properties?limit=50&fields=id,title,price",
+    "/api/property/{id}",
+)
+
+
+def seed(database_url, rows):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    code = (
+        "import random, app\n"
+        "with app.create_app().app_context():\n"
+        "    app.db.create_all()\n"
+        "    if app.Property.query.count() >= %d: raise SystemExit\n"
+        "    cities = ['Athens', 'Thessaloniki', 'Patra', 'Heraklion']\n"
+        "    app.db.session.execute(app.db.insert(app.Property), [\n"
+        "        {'title': 'Listing %%d' %% i, 'city': random.choice(cities),\n"
+        "         'price': random.randint(50, 900) * 1000, 'bedrooms': random.randint(0, 5),\n"
+        "         'description': 'Seeded for load testing', 'gallery_images': []}\n"
+        "        for i in range(%d)])\n"
+        "    app.db.session.commit()\n" % (rows, rows)
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/properties?limit=1")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start on port %d" % port)
+
+
+def client(port, deadline, rows, latencies, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    while time.time() < deadline:
+        path = random.choice(PATHS).format(id=random.randint(1, rows))
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def run(name, args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        **CONFIGS[name],
+        DATABASE_URL=args.database_url,
+        WEB_CONCURRENCY=str(args.workers),
+        CACHE_BACKEND="memory" if args.cache else "none",
+    )
+    server = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "--bind", "127.0.0.1:%d" % port, "app:create_app()"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port)
+        latencies, errors = [], []
+        deadline = time.time() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(port, deadline, args.rows, latencies, errors))
+            for _ in range(args.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    if not latencies:
+        print("%-10s no successful requests (%d errors)" % (name, len(errors)))
+        return
+    ms = sorted(l * 1000 for l in latencies)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print("%-10s %8.1f req/s   p50 %7.2f ms   p99 %7.2f ms   errors %d" % (
+        name, len(ms) / args.duration, statistics.median(ms), p99, len(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///" + os.path.join(tempfile.gettempdir(), "properties-load.sqlite"))
+    parser.add_argument("--configs", default="sync,gthread,gthread-8,gevent")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--cache", action="store_true")
+    args = parser.parse_args()
+
+    seed(args.database_url, args.rows)
+    for name in args.configs.split(","):
+        if name == "gevent":
+            try:
+                import gevent, psycogreen  # noqa: F401
+            except ImportError:
+                print("%-10s skipped (gevent / psycogreen not installed)" % name)
+                continue
+        run(name, args)
+
+
+if __name__ == "__main__":
+    main()
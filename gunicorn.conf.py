@@ -0,0 +1,61 @@
+"""Gunicorn settings, picked up automatically from the working directory.
+
+Everything is overridable through the environment:
+
+    GUNICORN_WORKER_CLASS  gthread (default) | sync | gevent
+    WEB_CONCURRENCY        worker processes (default: 2 * CPUs + 1, max 8)
+    GUNICORN_THREADS       threads per gthread worker (default 4)
+    GUNICORN_CONNECTIONS   greenlets per gevent worker (default 100)
+    GUNICORN_PRELOAD       import the app once in the master (default on,
+                           forced off for gevent)
+    GUNICORN_MAX_REQUESTS  recycle a worker after N requests (default 1000)
+    GUNICORN_TIMEOUT       seconds before a silent worker is killed (default 30)
+
+The request handlers are plain blocking Flask + SQLAlchemy code, so
+gthread is the default: threads overlap Postgres round trips without any
+monkey patching. gevent needs the `gevent` and `psycogreen` packages;
+psycogreen makes psycopg2 yield to other greenlets while it waits on the
+socket, otherwise one slow query blocks the whole worker.
+"""
+import multiprocessing
+import os
+
+bind = "0.0.0.0:%s" % os.getenv("PORT", "8000")
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_CONNECTIONS", "100"))
+
+# gevent must patch the stdlib before the app (and psycopg2) is imported,
+# which only happens in the worker when the app is not preloaded.
+preload_app = (
+    os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+    and worker_class != "gevent"
+)
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# One pooled connection per concurrent request in a worker, unless set
+# explicitly. Read by app.engine_options() when the app is imported.
+if worker_class == "gevent":
+    os.environ.setdefault("DB_POOL_SIZE", str(min(worker_connections, 20)))
+else:
+    os.environ.setdefault("DB_POOL_SIZE", str(threads))
+
+
+def post_fork(server, worker):
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    if preload_app:
+        # Building the app opens no connections, but anything the master
+        # did connect must not be shared with the forked workers.
+        from app import db
+        with server.app.wsgi().app_context():
+            db.engine.dispose(close=False)
@@ -0,0 +1,303 @@
+"""Schema migrations for the properties table.
+
+`db.create_all()` (run by `flask --app app init-db`) only creates missing
+tables, so changes to an existing table go through the ordered MIGRATIONS
+list below. Applied versions are recorded in `schema_migrations`; init-db
+applies pending ones too, or run just them with
+
+    flask --app app migrate [--batch-size N]
+
+Every step is safe to re-run, so an interrupted migration can simply be
+started again; an index left INVALID by a failed concurrent build is
+dropped and rebuilt. On Postgres, indexes are built with CREATE INDEX
+CONCURRENTLY and table rewrites are avoided: new columns are added empty,
+backfilled in short per-batch transactions, and swapped in with renames.
+"""
+import json
+import time
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateIndex
+
+from app import SEARCH_LANGUAGE, Property, db, parse_coordinates, to_int, to_year, to_timestamp
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Lock wait allowed for the short ALTER TABLE statements on Postgres
+LOCK_TIMEOUT = "5s"
+
+
+def is_postgres(engine):
+    return engine.dialect.name == "postgresql"
+
+
+def column_types(engine):
+    return {c["name"]: c["type"] for c in inspect(engine).get_columns("properties")}
+
+
+def drop_invalid_index(engine, name):
+    """Drop `name` if a failed CREATE INDEX CONCURRENTLY left it INVALID.
+
+    Otherwise IF NOT EXISTS would skip it on the re-run and the unusable
+    index would stay for good.
+    """
+    with engine.connect() as conn:
+        valid = conn.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": name},
+        ).scalar()
+    if valid is False:
+        drop_index(engine, name)
+
+
+def create_index(engine, index):
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+    if is_postgres(engine):
+        drop_invalid_index(engine, index.name)
+        ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(ddl))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(ddl))
+
+
+def drop_index(engine, name):
+    if is_postgres(engine):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS %s" % name))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS %s" % name))
+
+
+# ----------------------------
+# 0001: typed columns
+# ----------------------------
+# legacy text column -> (new column DDL type per dialect, parser)
+TYPED_COLUMNS = {
+    "gallery_images": ({"postgresql": "JSONB"}, "JSON", lambda v: json.loads(v) if v else None),
+    "floor": ({}, "INTEGER", to_int),
+    "year_built": ({}, "INTEGER", to_year),
+    "renovated_year": ({}, "INTEGER", to_year),
+    "created_at": ({"postgresql": "TIMESTAMP WITH TIME ZONE"}, "TIMESTAMP", to_timestamp),
+}
+
+
+def _safe(parse, value):
+    # Unparseable legacy values become NULL; the original stays in *_legacy
+    try:
+        return parse(value)
+    except ValueError:
+        return None
+
+
+def _backfill_table():
+    # Only the *_new columns; gallery_images_new uses the model's JSON type
+    # so values are encoded per dialect.
+    return db.Table(
+        "properties", db.MetaData(),
+        db.Column("id", db.Integer, primary_key=True),
+        db.Column("gallery_images_new", Property.__table__.c.gallery_images.type),
+        db.Column("floor_new", db.Integer),
+        db.Column("year_built_new", db.Integer),
+        db.Column("renovated_year_new", db.Integer),
+        db.Column("created_at_new", db.DateTime(timezone=True)),
+    )
+
+
+def _backfill_batch(conn, last_id, batch_size):
+    """Copy one id range of legacy values into the *_new columns.
+
+    Returns the last id copied, or None once the table is exhausted.
+    """
+    columns = list(TYPED_COLUMNS)
+    select_sql = "SELECT id, %s FROM properties WHERE id > :last_id ORDER BY id LIMIT :limit" % (
+        ", ".join(columns))
+
+    rows = conn.execute(text(select_sql), {"last_id": last_id, "limit": batch_size}).all()
+    if not rows:
+        return None
+
+    table = _backfill_table()
+    update = (
+        table.update()
+        .where(table.c.id == db.bindparam("row_id"))
+        .values({c + "_new": db.bindparam("v_" + c) for c in columns})
+    )
+    params = []
+    for row in rows:
+        item = {"row_id": row.id}
+        for c in columns:
+            item["v_" + c] = _safe(TYPED_COLUMNS[c][2], getattr(row, c))
+        params.append(item)
+    conn.execute(update, params)
+    return rows[-1].id
+
+
+def typed_columns(engine, batch_size):
+    """Move gallery_images to JSON(B), floor / years to INTEGER and
+    created_at to a timestamp.
+
+    1. add empty *_new columns (no table rewrite)
+    2. backfill them in batches, each batch its own short transaction
+    3. in one short transaction: catch up rows inserted since step 2
+       (ids above the last one it copied), rename old -> *_legacy and
+       *_new -> old
+    Rows are never updated in place by the app, so new ids are the only
+    writes that can be missed by step 2.
+    The *_legacy columns are kept for inspection and can be dropped by a
+    later migration.
+    """
+    types = column_types(engine)
+    if isinstance(types["created_at"], db.DateTime) and "created_at_new" not in types:
+        return  # created by create_all() with the current model
+
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        for column, (variants, default, _) in TYPED_COLUMNS.items():
+            if column + "_new" not in types:
+                conn.execute(text("ALTER TABLE properties ADD COLUMN %s_new %s"
+                                  % (column, variants.get(dialect, default))))
+
+    last_id = copied = 0
+    while last_id is not None:
+        with engine.begin() as conn:
+            last_id = _backfill_batch(conn, last_id, batch_size)
+        copied = last_id if last_id is not None else copied
+
+    # The string created_at index moves with its column; rebuilt by 0002
+    drop_index(engine, "ix_properties_created_at_id")
+
+    with engine.begin() as conn:
+        if is_postgres(engine):
+            # Block writes (not reads) while catching up, then swap
+            conn.execute(text("SET LOCAL lock_timeout = '%s'" % LOCK_TIMEOUT))
+            conn.execute(text("LOCK TABLE properties IN SHARE ROW EXCLUSIVE MODE"))
+        # Only the tail written since the backfill: an index range scan on
+        # the primary key instead of a full-table scan under the lock.
+        last_id = copied
+        while last_id is not None:
+            last_id = _backfill_batch(conn, last_id, batch_size)
+        for column in TYPED_COLUMNS:
+            conn.execute(text("ALTER TABLE properties RENAME COLUMN %s TO %s_legacy" % (column, column)))
+            conn.execute(text("ALTER TABLE properties RENAME COLUMN %s_new TO %s" % (column, column)))
+
+
+# ----------------------------
+# 0002: model indexes
+# ----------------------------
+def model_indexes(engine, batch_size):
+    """Create every index declared on Property that is missing.
+
+    Indexes on columns that a later migration adds are skipped here; that
+    migration calls this again once its columns exist.
+    """
+    existing = column_types(engine)
+    for index in Property.__table__.indexes:
+        if all(column.name in existing for column in index.columns):
+            create_index(engine, index)
+
+
+# ----------------------------
+# 0003: search columns
+# ----------------------------
+def _backfill_coordinates(engine, batch_size):
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, google_maps_link FROM properties "
+                "WHERE id > :last_id AND google_maps_link IS NOT NULL AND latitude IS NULL "
+                "ORDER BY id LIMIT :limit"
+            ), {"last_id": last_id, "limit": batch_size}).all()
+            if not rows:
+                return
+            params = []
+            for row in rows:
+                lat, lng = parse_coordinates(row.google_maps_link)
+                if lat is not None:
+                    params.append({"row_id": row.id, "lat": lat, "lng": lng})
+            if params:
+                conn.execute(text(
+                    "UPDATE properties SET latitude = :lat, longitude = :lng WHERE id = :row_id"
+                ), params)
+        last_id = rows[-1].id
+
+
+def search_columns(engine, batch_size):
+    """latitude / longitude parsed from google_maps_link, plus on Postgres
+    a generated, weighted `search_vector` tsvector with a GIN index.
+
+    Adding a STORED generated column rewrites the table on Postgres; run
+    this one in a quiet window on large tables.
+    """
+    types = column_types(engine)
+    with engine.begin() as conn:
+        for column in ("latitude", "longitude"):
+            if column not in types:
+                conn.execute(text("ALTER TABLE properties ADD COLUMN %s FLOAT" % column))
+    _backfill_coordinates(engine, batch_size)
+
+    if is_postgres(engine):
+        if "search_vector" not in types:
+            with engine.begin() as conn:
+                conn.execute(text("SET LOCAL lock_timeout = '%s'" % LOCK_TIMEOUT))
+                conn.execute(text(
+                    "ALTER TABLE properties ADD COLUMN search_vector tsvector "
+                    "GENERATED ALWAYS AS ("
+                    "setweight(to_tsvector('{lang}', coalesce(title, '')), 'A') || "
+                    "setweight(to_tsvector('{lang}', coalesce(region, '')), 'B') || "
+                    "setweight(to_tsvector('{lang}', coalesce(description, '')), 'C')"
+                    ") STORED".format(lang=SEARCH_LANGUAGE)
+                ))
+        drop_invalid_index(engine, "ix_properties_search_vector")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_properties_search_vector "
+                "ON properties USING GIN (search_vector)"
+            ))
+
+    model_indexes(engine, batch_size)
+
+
+MIGRATIONS = [
+    ("0001_typed_columns", typed_columns),
+    ("0002_model_indexes", model_indexes),
+    ("0003_search_columns", search_columns),
+    # (city, id) / (transaction_type, id) / (property_type, id)
+    ("0004_filter_indexes", model_indexes),
+]
+
+
+def applied_versions(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(255) PRIMARY KEY, applied_at FLOAT NOT NULL)"
+        ))
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def upgrade(engine, batch_size=BACKFILL_BATCH_SIZE, log=print):
+    """Apply pending migrations in order; returns the versions applied."""
+    if is_postgres(engine):
+        # Backfills and concurrent index builds can outlast the app's
+        # DB_STATEMENT_TIMEOUT_MS; migrations get their own engine without it.
+        engine = create_engine(engine.url, connect_args={"options": "-c statement_timeout=0"})
+    done = applied_versions(engine)
+    applied = []
+    for version, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        log("Applying %s" % version)
+        started = time.perf_counter()
+        migrate(engine, batch_size)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, applied_at) VALUES (:v, :t)"),
+                {"v": version, "t": time.time()},
+            )
+        log("Applied %s in %.1fs" % (version, time.perf_counter() - started))
+        applied.append(version)
+    return applied
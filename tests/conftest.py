@@ -0,0 +1,47 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # Fresh in-process cache per test so ETags and generations don't leak
+    monkeypatch.setattr(app_module, "response_cache", app_module.MemoryCache())
+    flask_app = app_module.create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "TESTING": True})
+    with flask_app.app_context():
+        app_module.db.create_all()
+        yield flask_app
+        app_module.db.session.remove()
+        app_module.db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def listings(app):
+    """60 properties with ties and NULLs in every sort column."""
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        app_module.Property(
+            title="Listing %d" % i,
+            city=rng.choice(["Athens", "Patra", None]),
+            price=rng.choice([None, 100000.0, 150000.0, 200000.0]),
+            year_built=rng.choice([None, 1990, 2005]),
+            created_at=rng.choice([None, start, start + timedelta(days=1)]),
+        )
+        for i in range(60)
+    ]
+    app_module.db.session.add_all(rows)
+    app_module.db.session.commit()
+    return rows
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+import app as app_module
+from app import Property, db
+
+
+@pytest.fixture
+def reject_bad_titles(app):
+    # Stands in for a constraint the form validation cannot see
+    db.session.execute(text(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON properties WHEN NEW.title = 'bad' "
+        "BEGIN SELECT RAISE(ABORT, 'secret driver detail'); END"
+    ))
+    db.session.commit()
+
+
+def test_bulk_inserts_and_reports_per_item(client, reject_bad_titles):
+    payload = [
+        {"text_1": "one", "currency_1": "100"},
+        {"text_1": "bad"},
+        {"text_1": "two", "number_2": "not a number"},
+        {"text_1": "three"},
+    ]
+    response = client.post("/api/properties/bulk?chunk_size=10", json=payload)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["inserted"], body["failed"]) == (2, 2)
+
+    ok, db_error, field_error, ok_again = body["results"]
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+    assert "id" in ok and "id" in ok_again
+    assert db_error == {"index": 1, "error": "constraint violation"}
+    assert field_error["error"].startswith("bathrooms:")
+    assert sorted(p.title for p in Property.query) == ["one", "three"]
+
+
+def test_bulk_ndjson_with_malformed_line(client):
+    body = "\n".join([json.dumps({"text_1": "a"}), "{nope", "", json.dumps({"text_1": "b"})])
+    response = client.post("/api/properties/bulk", data=body,
+                           content_type="application/x-ndjson")
+    results = response.get_json()["results"]
+    assert [("id" in r, r.get("error")) for r in results] == [
+        (True, None), (False, "invalid JSON"), (True, None)]
+
+
+def test_bulk_rejects_oversized_batches(client, monkeypatch):
+    monkeypatch.setattr(app_module, "BULK_MAX_ITEMS", 2)
+    response = client.post("/api/properties/bulk", json=[{}, {}, {}])
+    assert response.status_code == 413
+    assert Property.query.count() == 0
+
+
+def test_bulk_rejects_non_array(client):
+    assert client.post("/api/properties/bulk", json={"text_1": "x"}).status_code == 400
+
+
+def test_bulk_invalidates_cached_pages(client, listings):
+    etag = client.get("/api/properties?limit=500").headers["ETag"]
+    client.post("/api/properties/bulk", json=[{"text_1": "Bulk 1"}, {"text_1": "Bulk 2"}])
+
+    after = client.get("/api/properties?limit=500", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert [p["title"] for p in after.get_json()[-2:]] == ["Bulk 1", "Bulk 2"]
+
+
+def test_bulk_bind_errors_only_fail_their_row(client, monkeypatch):
+    normalize = app_module.normalize_submission
+
+    def unchecked(payload):
+        # A value the converters would reject, to reach the driver
+        normalized = normalize(payload)
+        if normalized.get("title") == "huge":
+            normalized["bathrooms"] = 10 ** 20
+        return normalized
+
+    monkeypatch.setattr(app_module, "normalize_submission", unchecked)
+    response = client.post("/api/properties/bulk",
+                           json=[{"text_1": "ok"}, {"text_1": "huge"}, {"text_1": "ok too"}])
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert "id" in results[0] and "id" in results[2]
+    assert results[1] == {"index": 1, "error": "value out of range for its column"}
+    assert sorted(p.title for p in Property.query) == ["ok", "ok too"]
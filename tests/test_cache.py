@@ -0,0 +1,129 @@
+import threading
+
+import app as app_module
+from app import LocalKeyValueStore, MemoryCache, SharedCache
+
+
+def test_local_store_semantics():
+    store = LocalKeyValueStore()
+    assert store.get("k") is None
+    assert store.incr("k") == 1
+    assert store.incr("k") == 2
+    assert store.get("k") == b"2"
+    assert store.set("k", "x", nx=True) is None
+    assert store.get("k") == b"2"
+    store.set("e", "v", ex=-1)
+    assert store.get("e") is None
+
+
+def test_shared_cache_invalidate_hides_entries():
+    cache = SharedCache(LocalKeyValueStore())
+    generation, last_modified = cache.generation()
+    assert generation == 0
+    assert cache.generation()[1] == last_modified  # pinned on first use
+
+    cache.set("%d:/api/properties" % generation, {"body": "[]"})
+    assert cache.get("%d:/api/properties" % generation) == {"body": "[]"}
+
+    cache.invalidate()
+    new_generation, new_last_modified = cache.generation()
+    assert new_generation == 1
+    assert new_last_modified > last_modified
+    assert cache.get("%d:/api/properties" % new_generation) is None
+
+
+def test_shared_cache_concurrent_invalidations_all_count():
+    cache = SharedCache(LocalKeyValueStore())
+    threads = [threading.Thread(target=lambda: [cache.invalidate() for _ in range(50)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.generation()[0] == 400
+
+
+def entry(size):
+    return {"body": "x" * size, "mimetype": "application/json", "etag": "e",
+            "last_modified": 0, "headers": {}}
+
+
+def test_memory_cache_evicts_by_total_bytes():
+    cache = MemoryCache(max_entries=100, max_bytes=250)
+    for key in "abc":
+        cache.set(key, entry(100))
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+
+    cache.set("b", entry(10))  # replacing an entry releases its old size
+    cache.set("d", entry(100))
+    assert all(cache.get(k) is not None for k in "bcd")
+
+
+def test_memory_cache_skips_oversized_bodies():
+    cache = MemoryCache(max_bytes=50)
+    cache.set("small", entry(10))
+    cache.set("huge", entry(51))
+    assert cache.get("huge") is None
+    assert cache.get("small") is not None
+
+
+def test_conditional_requests_get_304(client, listings):
+    first = client.get("/api/properties?limit=5")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    assert client.get("/api/properties?limit=5", headers={"If-None-Match": etag}).status_code == 304
+    since = client.get("/api/properties?limit=5",
+                       headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    second = client.get("/api/properties?limit=5&cursor=" + first.headers["X-Next-Cursor"])
+    assert second.headers["ETag"] != etag
+
+
+def test_post_invalidates_cached_pages(client, listings):
+    before = client.get("/api/properties?limit=500")
+    etag = before.headers["ETag"]
+
+    created = client.post("/api/property", json={"text_1": "Fresh"})
+    assert created.get_json()["success"]
+
+    after = client.get("/api/properties?limit=500", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.get_json()[-1]["title"] == "Fresh"
+
+
+def test_oversized_bodies_are_served_but_not_cached(client, listings, monkeypatch):
+    monkeypatch.setattr(app_module, "CACHE_MAX_ENTRY_BYTES", 10)
+    response = client.get("/api/properties?limit=3")
+    assert response.status_code == 200 and response.headers["ETag"]
+    generation, _ = app_module.response_cache.generation()
+    assert app_module.response_cache.get("%d:http://localhost/api/properties?limit=3" % generation) is None
+
+
+def test_every_invalidation_moves_last_modified_forward():
+    for cache in (MemoryCache(), SharedCache(LocalKeyValueStore())):
+        seen = [cache.generation()[1]]
+        for _ in range(3):  # well within one second
+            cache.invalidate()
+            seen.append(cache.generation()[1])
+        assert all(isinstance(t, int) for t in seen)
+        assert seen == sorted(set(seen))
+
+
+def test_write_in_the_same_second_is_not_a_304(client, listings):
+    first = client.get("/api/properties?limit=500")
+    client.post("/api/property", json={"text_1": "Fresh"})
+
+    after = client.get("/api/properties?limit=500",
+                       headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert after.status_code == 200
+    assert after.get_json()[-1]["title"] == "Fresh"
+
+
+def test_cached_link_header_keeps_the_callers_host(client, listings):
+    a = client.get("/api/properties?limit=5", base_url="http://a.example")
+    b = client.get("/api/properties?limit=5", base_url="https://b.example")
+    assert a.headers["Link"].startswith("<http://a.example/")
+    assert b.headers["Link"].startswith("<https://b.example/")
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Several yield_per batches even for the small fixture table
+    monkeypatch.setattr(app_module, "EXPORT_BATCH_SIZE", 7)
+
+
+def export(client, query=""):
+    response = client.get("/api/properties/export" + query)
+    body = response.get_data(as_text=True)
+    response.close()
+    return response, body
+
+
+def test_json_export_is_one_array(client, listings):
+    response, body = export(client, "?format=json")
+    assert response.mimetype == "application/json"
+    items = json.loads(body)
+    assert [p["id"] for p in items] == sorted(p.id for p in listings)
+
+
+def test_json_export_of_empty_table(client):
+    response, body = export(client, "?format=json")
+    assert json.loads(body) == []
+
+
+def test_ndjson_export_is_one_object_per_line(client, listings):
+    response, body = export(client)
+    assert response.mimetype == "application/x-ndjson"
+    lines = body.splitlines()
+    assert body.endswith("\n")
+    assert len(lines) == len(listings)
+    assert all(isinstance(json.loads(line), dict) for line in lines)
+
+
+def test_ndjson_export_of_empty_table(client):
+    assert export(client, "?format=ndjson")[1] == ""
+
+
+def test_export_applies_filters_and_fields(client, listings):
+    _, body = export(client, "?format=json&city=Athens&min_price=150000&fields=id,price")
+    items = json.loads(body)
+    expected = sorted(p.id for p in listings
+                      if p.city == "Athens" and p.price is not None and p.price >= 150000)
+    assert [p["id"] for p in items] == expected
+    assert all(set(p) == {"id", "price"} for p in items)
+
+
+@pytest.mark.parametrize("query", [
+    "?format=csv",
+    "?fields=id,nope",
+    "?min_price=cheap",
+    "?bedrooms=2.5",
+    "?created_after=someday",
+])
+def test_export_rejects_invalid_args(client, listings, query):
+    response, body = export(client, query)
+    assert response.status_code == 400
+    assert json.loads(body)["success"] is False
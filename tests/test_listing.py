@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+SORTS = ("id", "price", "year_built", "created_at")
+
+
+def walk(client, query):
+    ids, url, pages = [], "/api/properties?" + query, 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.get_json()]
+        url = response.headers.get("X-Next-Cursor")
+        if url:
+            assert 'rel="next"' in response.headers["Link"]
+            url = "/api/properties?%s&cursor=%s" % (query, url)
+        pages += 1
+        assert pages < 100
+    return ids
+
+
+def expected_order(rows, sort, descending):
+    # (value, id) ascending or descending as a whole, NULL values last
+    def key(p):
+        value = getattr(p, sort)
+        if isinstance(value, datetime) and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+    present = sorted((p for p in rows if key(p) is not None),
+                     key=lambda p: (key(p), p.id), reverse=descending)
+    missing = sorted((p for p in rows if key(p) is None), key=lambda p: p.id, reverse=descending)
+    return [p.id for p in present + missing]
+
+
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 7, 500])
+def test_keyset_walk_visits_every_row_once(client, listings, sort, descending, limit):
+    query = "sort=%s%s&limit=%d" % ("-" if descending else "", sort, limit)
+    assert walk(client, query) == expected_order(listings, sort, descending)
+
+
+def test_keyset_walk_with_filter(client, listings):
+    athens = [p for p in listings if p.city == "Athens"]
+    assert walk(client, "city=Athens&sort=-price&limit=4") == expected_order(athens, "price", True)
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("bad", [
+    "not base64!",
+    cursor({"a": 1}),
+    cursor(["x", 1]),
+    cursor([1, "x"]),
+    cursor([[1], 2]),
+    cursor(["NaN", 3]),
+])
+def test_bad_cursors_are_400(client, listings, bad):
+    response = client.get("/api/properties?sort=price&cursor=" + bad)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("sort", ["--price", "-", "", "-title", "price-"])
+def test_bad_sort_is_400(client, listings, sort):
+    assert client.get("/api/properties?sort=" + sort).status_code == 400
@@ -0,0 +1,36 @@
+import threading
+
+import app as app_module
+from app import Metrics, Property, db
+
+
+def test_slow_query_counter_is_thread_safe():
+    metrics = Metrics()
+    threads = [threading.Thread(target=lambda: [metrics.slow_query() for _ in range(1000)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert "db_slow_queries_total 8000" in metrics.render()
+
+
+def test_export_is_timed_after_the_body_is_streamed(client, monkeypatch):
+    metrics = Metrics()
+    monkeypatch.setattr(app_module, "metrics", metrics)
+    db.session.add_all([Property(title="p%d" % i) for i in range(3)])
+    db.session.commit()
+
+    response = client.get("/api/properties/export")
+    assert "Server-Timing" not in response.headers
+    assert response.get_data(as_text=True).count('"title"') == 3
+    response.close()
+
+    (counts, count, total), = [v for (route, _), v in metrics.histograms.items()
+                               if route == "/api/properties/export"]
+    assert count == 1
+    assert metrics.db_queries["/api/properties/export"] >= 1
+
+
+def test_regular_requests_get_server_timing(client):
+    assert "total;dur=" in client.get("/api/properties").headers["Server-Timing"]
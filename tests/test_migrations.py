@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import migrations
+
+# properties as created by the original app (string-typed columns, gallery
+# as a JSON-encoded TEXT)
+BASELINE_SCHEMA = """
+CREATE TABLE properties (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255), description TEXT,
+    transaction_type VARCHAR(64), property_type VARCHAR(64),
+    price FLOAT, area_size FLOAT, bathrooms INTEGER, bedrooms INTEGER,
+    city VARCHAR(128), google_maps_link VARCHAR(1024), region VARCHAR(128),
+    main_image VARCHAR(1024), gallery_images TEXT,
+    furnished BOOLEAN, parking BOOLEAN, elevator BOOLEAN, pets_allowed BOOLEAN,
+    air_conditioning BOOLEAN, balcony BOOLEAN, storage_room BOOLEAN, sea_view BOOLEAN,
+    floor VARCHAR(64), year_built VARCHAR(64), renovated_year VARCHAR(64),
+    created_at VARCHAR(64), status VARCHAR(64)
+)
+"""
+
+INSERT = text(
+    "INSERT INTO properties (title, city, google_maps_link, gallery_images, floor, "
+    "year_built, renovated_year, created_at) VALUES "
+    "(:title, 'Athens', :link, :gallery, :floor, :year, NULL, :created)"
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine("sqlite:///%s" % (tmp_path / "baseline.sqlite"))
+    with engine.begin() as conn:
+        conn.execute(text(BASELINE_SCHEMA))
+        conn.execute(INSERT, [
+            {"title": "A", "link": "https://maps.google.com/?q=37.94,23.64",
+             "gallery": json.dumps(["a.jpg", "b.jpg"]), "floor": "2", "year": "1998",
+             "created": "2024-05-01 10:00:00"},
+            {"title": "B", "link": None, "gallery": "", "floor": "ground",
+             "year": "n/a", "created": "yesterday"},
+        ])
+    return engine
+
+
+def test_upgrade_from_baseline(engine):
+    applied = migrations.upgrade(engine, batch_size=1, log=lambda message: None)
+    assert applied == [version for version, _ in migrations.MIGRATIONS]
+
+    columns = {c["name"] for c in inspect(engine).get_columns("properties")}
+    assert {"floor_legacy", "created_at_legacy", "latitude", "longitude"} <= columns
+    assert not any(c.endswith("_new") for c in columns)
+    indexes = {i["name"] for i in inspect(engine).get_indexes("properties")}
+    assert {"ix_properties_city_id", "ix_properties_created_at_id", "ix_properties_lat_lng"} <= indexes
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT title, gallery_images, floor, year_built, created_at, floor_legacy, "
+            "latitude, longitude FROM properties ORDER BY id"
+        )).all()
+    a, b = rows
+    assert json.loads(a.gallery_images) == ["a.jpg", "b.jpg"]
+    assert (a.floor, a.year_built) == (2, 1998)
+    assert a.created_at.startswith("2024-05-01 10:00:00")
+    assert (a.latitude, a.longitude) == (37.94, 23.64)
+    # unparseable values become NULL and survive in *_legacy
+    assert (b.floor, b.year_built, b.created_at) == (None, None, None)
+    assert b.floor_legacy == "ground"
+
+    assert migrations.upgrade(engine, log=lambda message: None) == []
+
+
+def test_rows_inserted_during_backfill_are_caught_up(engine, monkeypatch):
+    drop_index = migrations.drop_index
+
+    def insert_then_drop(engine, name):
+        # Runs between the batched backfill and the locked catch-up
+        with engine.begin() as conn:
+            conn.execute(INSERT, {"title": "C", "link": None, "gallery": "[]", "floor": "5",
+                                  "year": "2010", "created": "2024-06-01"})
+        drop_index(engine, name)
+
+    monkeypatch.setattr(migrations, "drop_index", insert_then_drop)
+    migrations.typed_columns(engine, batch_size=1)
+
+    with engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT floor, year_built FROM properties WHERE title = 'C'")).one()
+    assert (row.floor, row.year_built) == (5, 2010)
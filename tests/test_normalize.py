@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import (
+    FieldError, Property, normalize_submission, to_bool, to_float, to_int, to_timestamp,
+    to_url, to_year,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("one", True), ("two", False), ("", None), (None, None), (True, True), (False, False),
+])
+def test_to_bool(value, expected):
+    assert to_bool(value) is expected
+
+
+@pytest.mark.parametrize("value", ["yes", 2, [], {}])
+def test_to_bool_rejects(value):
+    with pytest.raises(ValueError):
+        to_bool(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("82.5", 82.5), (" 3 ", 3.0), (7, 7.0), (1.5, 1.5), ("", None), ("  ", None), (None, None),
+])
+def test_to_float(value, expected):
+    assert to_float(value) == expected
+
+
+@pytest.mark.parametrize("value", ["inf", "-inf", "nan", "NaN", float("inf"), "abc", [], {}])
+def test_to_float_rejects(value):
+    with pytest.raises(ValueError):
+        to_float(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2", 2), ("2.0", 2), (-3, -3), ("", None), (None, None),
+    (str(2 ** 31 - 1), 2 ** 31 - 1), (str(-2 ** 31), -2 ** 31),
+])
+def test_to_int(value, expected):
+    assert to_int(value) == expected
+
+
+@pytest.mark.parametrize("value", ["2.5", "1e20", str(2 ** 31), str(-2 ** 31 - 1), "x"])
+def test_to_int_rejects(value):
+    with pytest.raises(ValueError):
+        to_int(value)
+
+
+@pytest.mark.parametrize("value, expected", [("1998", 1998), ("2100", 2100), ("", None)])
+def test_to_year(value, expected):
+    assert to_year(value) == expected
+
+
+@pytest.mark.parametrize("value", ["999", "2101", "1998.5", "1e20"])
+def test_to_year_rejects(value):
+    with pytest.raises(ValueError):
+        to_year(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (" https://example.com/a ", "https://example.com/a"),
+    ("HTTP://Example.com", "HTTP://Example.com"),
+    ("", None), (None, None),
+])
+def test_to_url(value, expected):
+    assert to_url(value) == expected
+
+
+@pytest.mark.parametrize("value", ["ftp://example.com", "example.com", "https://", 5])
+def test_to_url_rejects(value):
+    with pytest.raises(ValueError):
+        to_url(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-05-01 10:00:00", datetime(2024, 5, 1, 10, tzinfo=timezone.utc)),
+    ("2024-05-01T10:00:00+02:00",
+     datetime(2024, 5, 1, 10, tzinfo=timezone(timedelta(hours=2)))),
+    ("01/05/2024 10:00:00", datetime(2024, 5, 1, 10, tzinfo=timezone.utc)),
+    ("01/05/2024", datetime(2024, 5, 1, tzinfo=timezone.utc)),
+    ("1.5.2024", datetime(2024, 5, 1, tzinfo=timezone.utc)),
+    ("October 17, 2026", datetime(2026, 10, 17, tzinfo=timezone.utc)),
+    ("October 7, 2026 3:05 pm", datetime(2026, 10, 7, 15, 5, tzinfo=timezone.utc)),
+    ("", None), (None, None),
+])
+def test_to_timestamp(value, expected):
+    parsed = to_timestamp(value)
+    assert parsed == expected
+    assert parsed is None or parsed.tzinfo is not None
+
+
+@pytest.mark.parametrize("value", ["yesterday", "2024-13-01", 20240501])
+def test_to_timestamp_rejects(value):
+    with pytest.raises(ValueError):
+        to_timestamp(value)
+
+
+def test_normalize_reports_the_failing_column():
+    with pytest.raises(FieldError) as error:
+        normalize_submission({"text_1": "x", "number_2": "1e20"})
+    assert (error.value.field, error.value.message) == ("bathrooms", "number out of range")
+
+
+@pytest.mark.parametrize("payload, field", [
+    ({"number_2": "1e20"}, "bathrooms"),
+    ({"number_1": "nan"}, "area_size"),
+    ({"number_5": "999"}, "year_built"),
+    ({"url_1": "javascript:alert(1)"}, "google_maps_link"),
+    ({"radio_3": "maybe"}, "furnished"),
+    ({"text_1": {"a": 1}}, "title"),
+])
+def test_create_property_rejects_bad_fields(client, payload, field):
+    response = client.post("/api/property", json=payload)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["success"] is False
+    assert body["field"] == field
+    assert body["error"]
+    assert Property.query.count() == 0
+
+
+def test_create_property_rejects_non_object(client):
+    response = client.post("/api/property", json=["not", "an", "object"])
+    assert (response.status_code, response.get_json()["field"]) == (400, "payload")
+
+
+def test_unrecognized_submission_date_is_stored_as_null(client):
+    response = client.post("/api/property", json={"text_1": "x", "hidden_2": "last Tuesday"})
+    assert response.status_code == 200
+    prop = Property.query.one()
+    assert (prop.title, prop.created_at) == ("x", None)
+
+
+def test_wordpress_submission_date_is_parsed(client):
+    client.post("/api/property", json={"text_1": "x", "hidden_2": "October 17, 2026"})
+    assert Property.query.one().to_json()["created_at"].startswith("2026-10-17")
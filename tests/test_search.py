@@ -0,0 +1,37 @@
+from app import Property, db
+
+
+def test_search_highlights_are_escaped(client, app):
+    db.session.add(Property(title="Villa <img src=x onerror=alert(1)>",
+                            description="A villa & garden"))
+    db.session.commit()
+
+    (item,) = client.get("/api/properties/search?q=villa").get_json()
+    assert item["search"]["highlight"]["title"] == \
+        "<b>Villa</b> &lt;img src=x onerror=alert(1)&gt;"
+    assert "&amp;" in item["search"]["highlight"]["description"]
+
+
+def test_geo_search_orders_by_distance(client, app):
+    db.session.add_all([
+        Property(title="far", latitude=38.5, longitude=23.64),
+        Property(title="near", latitude=37.95, longitude=23.64),
+        Property(title="unknown"),
+    ])
+    db.session.commit()
+
+    items = client.get("/api/properties/search?lat=37.94&lng=23.64&radius_km=100").get_json()
+    assert [p["title"] for p in items] == ["near", "far"]
+    assert items[0]["search"]["distance_km"] < items[1]["search"]["distance_km"]
+
+
+def test_unsearchable_q_keeps_geo_constraints(client, app):
+    db.session.add_all([
+        Property(title="near", latitude=37.95, longitude=23.64),
+        Property(title="elsewhere", latitude=40.6, longitude=22.9),
+    ])
+    db.session.commit()
+
+    items = client.get("/api/properties/search?q=-&lat=37.94&lng=23.64&radius_km=10").get_json()
+    assert [p["title"] for p in items] == ["near"]
+    assert client.get("/api/properties/search?q=-").get_json() == []